@@ -6,6 +6,10 @@ import os
 import subprocess
 import sys
 import shutil
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
 
 FISH_CONFIG = """\
@@ -64,9 +68,20 @@ set -ga terminal-overrides ",xterm*:colors=256"
 set -ga terminal-overrides '*:Ss=\\E[%p1%d q:Se=\\E[ q'
 """
 
+FISH_CONFIG_BYTES = FISH_CONFIG.encode("utf-8")
+TMUX_CONFIG_BYTES = TMUX_CONFIG.encode("utf-8")
+WORKTRUNK_WORKTREE_PATH_LINE = 'worktree-path = ".worktrees/{{ branch | sanitize }}"'
+
+SETUP_MAX_WORKERS = 4
+
+SetupStep = tuple[Callable[[], None], tuple[str, ...]]
+
+_log_lock = threading.Lock()
+
 
 def log(message: str) -> None:
-    print(f"post-install: {message}", file=sys.stderr)
+    with _log_lock:
+        print(f"post-install: {message}", file=sys.stderr)
 
 
 def run_git(
@@ -117,6 +132,13 @@ def is_git_repo(cwd: Path) -> bool:
     return result.returncode == 0 and result.stdout.strip() == "true"
 
 
+def read_bytes_if_exists(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
 def ensure_global_gitignore(workspace: Path) -> None:
     result = run_git(["config", "--global", "--path", "core.excludesfile"], workspace)
     if result.returncode != 0:
@@ -200,8 +222,11 @@ def ensure_fish_config() -> None:
     )
     fish_config_dir.mkdir(parents=True, exist_ok=True)
     fish_config = fish_config_dir / "config.fish"
-    if fish_config.exists():
-        existing = fish_config.read_text(encoding="utf-8")
+    existing_bytes = read_bytes_if_exists(fish_config)
+    if existing_bytes == FISH_CONFIG_BYTES:
+        return
+    if existing_bytes is not None:
+        existing = existing_bytes.decode("utf-8")
         if existing.lstrip().startswith("# default fish config for the devcontainer"):
             fish_config.write_text(FISH_CONFIG, encoding="utf-8")
             log(f"updated default fish config at {fish_config}")
@@ -288,22 +313,13 @@ def ensure_worktrunk_installed() -> None:
     log("installed worktrunk with cargo")
 
 
-def ensure_worktrunk_config() -> None:
-    config_dir = Path.home() / ".config" / "worktrunk"
-    config_dir.mkdir(parents=True, exist_ok=True)
-    config_path = config_dir / "config.toml"
-    desired_line = 'worktree-path = ".worktrees/{{ branch | sanitize }}"'
-
-    existing_lines: list[str] = []
-    if config_path.exists():
-        existing_lines = config_path.read_text(encoding="utf-8").splitlines()
-
+def render_worktrunk_config(existing: str) -> str:
     updated_lines: list[str] = []
     replaced = False
-    for line in existing_lines:
+    for line in existing.splitlines():
         if line.strip().startswith("worktree-path"):
             if not replaced:
-                updated_lines.append(desired_line)
+                updated_lines.append(WORKTRUNK_WORKTREE_PATH_LINE)
                 replaced = True
             continue
         updated_lines.append(line)
@@ -311,10 +327,20 @@ def ensure_worktrunk_config() -> None:
     if not replaced:
         if updated_lines and updated_lines[-1].strip() != "":
             updated_lines.append("")
-        updated_lines.append(desired_line)
+        updated_lines.append(WORKTRUNK_WORKTREE_PATH_LINE)
 
-    rendered = "\n".join(updated_lines).rstrip() + "\n"
-    if config_path.exists() and config_path.read_text(encoding="utf-8") == rendered:
+    return "\n".join(updated_lines).rstrip() + "\n"
+
+
+def ensure_worktrunk_config() -> None:
+    config_dir = Path.home() / ".config" / "worktrunk"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    config_path = config_dir / "config.toml"
+
+    existing_bytes = read_bytes_if_exists(config_path)
+    existing = existing_bytes.decode("utf-8") if existing_bytes is not None else ""
+    rendered = render_worktrunk_config(existing)
+    if existing_bytes is not None and existing == rendered:
         log(f"worktrunk config already up to date at {config_path}")
         return
 
@@ -356,7 +382,10 @@ def ensure_dir_ownership(path: Path) -> None:
 
 def install_tmux_config() -> None:
     tmux_dest = Path.home() / ".tmux.conf"
-    if tmux_dest.exists():
+    existing_bytes = read_bytes_if_exists(tmux_dest)
+    if existing_bytes == TMUX_CONFIG_BYTES:
+        return
+    if existing_bytes is not None:
         log(f"skipping tmux config (already exists at {tmux_dest})")
         return
 
@@ -364,25 +393,71 @@ def install_tmux_config() -> None:
     log(f"installed tmux config to {tmux_dest}")
 
 
+def run_setup_steps(steps: dict[str, SetupStep]) -> None:
+    # Steps are mostly independent subprocess/filesystem work, so run each one
+    # as soon as the steps it depends on have finished.
+    remaining = dict(steps)
+    done: set[str] = set()
+    running: dict[Future[None], str] = {}
+
+    with ThreadPoolExecutor(max_workers=SETUP_MAX_WORKERS) as executor:
+        while remaining or running:
+            for name, (step, deps) in list(remaining.items()):
+                if all(dep in done for dep in deps):
+                    running[executor.submit(step)] = name
+                    del remaining[name]
+
+            if not running:
+                raise RuntimeError(
+                    f"unresolvable setup step dependencies: {sorted(remaining)}"
+                )
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                future.result()
+                done.add(name)
+
+
 def main() -> None:
     workspace = resolve_workspace()
     if not is_git_repo(workspace):
         log(f"skipping git repo checks (no repo at {workspace})")
 
-    install_tmux_config()
-    ensure_dir_ownership(Path("/commandhistory"))
-    ensure_dir_ownership(Path.home() / ".claude")
-    ensure_dir_ownership(Path.home() / ".codex")
-    ensure_dir_ownership(Path.home() / ".config" / "gh")
-    ensure_fish_history()
-    ensure_global_gitignore(workspace)
-    ensure_git_worktree_relative_paths()
-    ensure_codex_config()
-    ensure_claude_config()
-    ensure_fish_config()
-    ensure_worktrunk_installed()
-    ensure_worktrunk_config()
-    ensure_worktrunk_shell_integration()
+    steps: dict[str, SetupStep] = {
+        "tmux-config": (install_tmux_config, ()),
+        "commandhistory-ownership": (
+            partial(ensure_dir_ownership, Path("/commandhistory")),
+            (),
+        ),
+        "claude-ownership": (
+            partial(ensure_dir_ownership, Path.home() / ".claude"),
+            (),
+        ),
+        "codex-ownership": (
+            partial(ensure_dir_ownership, Path.home() / ".codex"),
+            (),
+        ),
+        "gh-ownership": (
+            partial(ensure_dir_ownership, Path.home() / ".config" / "gh"),
+            (),
+        ),
+        "fish-history": (ensure_fish_history, ("commandhistory-ownership",)),
+        "global-gitignore": (partial(ensure_global_gitignore, workspace), ()),
+        "git-worktree-relative-paths": (ensure_git_worktree_relative_paths, ()),
+        "codex-config": (ensure_codex_config, ("codex-ownership",)),
+        "claude-config": (ensure_claude_config, ("claude-ownership",)),
+        "fish-config": (ensure_fish_config, ()),
+        "worktrunk-installed": (ensure_worktrunk_installed, ()),
+        "worktrunk-config": (ensure_worktrunk_config, ("worktrunk-installed",)),
+        # `wt config shell install` edits shell config, so it must run after
+        # the fish config has been (re)written.
+        "worktrunk-shell-integration": (
+            ensure_worktrunk_shell_integration,
+            ("worktrunk-installed", "worktrunk-config", "fish-config"),
+        ),
+    }
+    run_setup_steps(steps)
     log("configured defaults for container use")
 
 